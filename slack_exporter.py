@@ -1,14 +1,28 @@
 import os
 import time
 import argparse
+import asyncio
 import sys
 import re
-from slack_sdk import WebClient
+import json
+import atexit
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from html import escape, unescape
+import aiohttp
+from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_async_handlers import (
+    async_default_handlers, AsyncRateLimitErrorRetryHandler, AsyncServerErrorRetryHandler)
 from dotenv import load_dotenv
-from datetime import datetime, timezone
 from tqdm import tqdm  # Progress bar
 
+try:
+    import re2 as re_fast  # Optional linear-time (RE2) regex engine for link parsing
+except ImportError:
+    re_fast = re
+
 # Load the environment variables from the .env file
 load_dotenv()
 
@@ -19,14 +33,60 @@ parser.add_argument('-t', '--output_type', type=str, choices=['txt', 'html'], de
                     help="Specify output type: txt or html (default is txt)")
 args = parser.parse_args()
 
-# Cache for user info to avoid multiple API calls for the same user
-user_cache = {}
+# Where the user and channel caches of each workspace are persisted between runs, and how long (in seconds)
+# a cached entry stays valid
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'slack_exporter')
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "86400"))
+
+# Channel fields kept in the persisted channel cache
+CACHED_CHANNEL_FIELDS = ('id', 'name', 'is_im', 'is_mpim')
+
+# Maximum number of Slack API requests in flight at once (keeps us within Slack's Tier-3 rate limits)
+MAX_CONCURRENT_REQUESTS = int(os.getenv("SLACK_MAX_CONCURRENT_REQUESTS", "3"))
+
+# Size of the keep-alive connection pool shared by all Slack API calls, and their timeout in seconds
+HTTP_POOL_SIZE = 32
+HTTP_TIMEOUT = 30
 
-# Cache for messages to avoid redundant API calls for replies
-message_cache = {}
+# Number of retries for rate limited (HTTP 429) and failed (HTTP 5xx) Slack API calls
+MAX_RETRIES = 5
+
+# Output files are assembled in memory and written through a large buffer, in chunks of this many lines
+WRITE_BUFFER_SIZE = 1024 * 1024
+WRITE_CHUNK_LINES = 4096
+
+# Number of processed messages between progress bar updates
+PBAR_BATCH = 256
 
 # Link pattern for Slack's custom link format <http://example.com|example> and also <http://example.com>
-link_pattern = re.compile(r'<(http[s]?://[^|>]+)(?:\|([^>]*))?>')
+link_pattern = re_fast.compile(r'<(http[s]?://[^|>]+)(?:\|([^>]*))?>')
+
+# Characters that are stripped from conversation names to build file names (keeps letters, digits, ' ', '-' and '_')
+unsafe_filename_pattern = re.compile(r'[^\w \-]')
+
+class SlackExportClient(AsyncWebClient):
+    """Slack client that carries the caches of its own workspace, since Slack IDs are only unique per workspace."""
+
+    def __init__(self, **kwargs):
+        # Retry rate limited and failed calls on top of the default connection error retries
+        kwargs.setdefault('retry_handlers', async_default_handlers() + [
+            AsyncRateLimitErrorRetryHandler(max_retry_count=MAX_RETRIES),
+            AsyncServerErrorRetryHandler(max_retry_count=MAX_RETRIES),
+        ])
+        super().__init__(**kwargs)
+        # Workspace (team) ID, used as the key of the persisted caches
+        self.team_id = None
+        # Cache for user info to avoid multiple API calls for the same user
+        self.user_cache = {}
+        # Cache for messages to avoid redundant API calls for replies
+        self.message_cache = {}
+        # Cache of channels by name to avoid listing all conversations again
+        self.channel_cache = {}
+        self.channels_listed = False
+        # When the persisted cache entries were fetched, and when all users were last listed (epoch seconds)
+        self.user_fetched_at = {}
+        self.channel_fetched_at = {}
+        self.users_listed_at = 0
 
 def get_slack_tokens():
     """Finds and returns all Slack tokens from the .env file."""
@@ -36,206 +96,410 @@ def get_slack_tokens():
             tokens[key] = value
     return tokens
 
-def get_user_info(client, user_id):
+async def get_user_info(client, user_id):
     """Fetches user information, using cache to reduce redundant API requests."""
-    if user_id in user_cache:
-        return user_cache[user_id]
+    if user_id in client.user_cache:
+        return client.user_cache[user_id]
     try:
-        response = client.users_info(user=user_id)
+        response = await client.users_info(user=user_id)
         user = response['user']
         user_name = user.get('real_name') or user.get('display_name') or user.get('name')
-        user_cache[user_id] = user_name
+        client.user_cache[user_id] = user_name
         return user_name
     except SlackApiError as e:
         return "Unknown User"
 
-def get_workspace_name(client):
-    """Fetches the workspace (team) name."""
+def load_persistent_cache(client):
+    """Rehydrates the user and channel caches of a workspace from disk, skipping entries older than USER_CACHE_TTL."""
+    filename = os.path.join(CACHE_DIR, f'{client.team_id}.json')
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        expiry = time.time() - USER_CACHE_TTL
+        for user_id, entry in data.get('users', {}).items():
+            if entry['fetched_at'] > expiry:
+                client.user_cache[user_id] = entry['name']
+                client.user_fetched_at[user_id] = entry['fetched_at']
+        for channel_name, entry in data.get('channels', {}).items():
+            if entry['fetched_at'] > expiry:
+                client.channel_cache[channel_name] = entry['channel']
+                client.channel_fetched_at[channel_name] = entry['fetched_at']
+        client.users_listed_at = data.get('users_listed_at', 0)
+    except (OSError, ValueError, KeyError, TypeError):
+        return  # Missing or unreadable cache, everything is fetched again
+
+def save_persistent_cache(client):
+    """Persists the user and channel caches of a workspace so that later runs can skip fetching them."""
+    now = time.time()
+    data = {
+        'users_listed_at': client.users_listed_at,
+        'users': {user_id: {'name': user_name, 'fetched_at': client.user_fetched_at.get(user_id, now)}
+                  for user_id, user_name in client.user_cache.items()},
+        'channels': {channel_name: {'channel': {key: channel[key] for key in CACHED_CHANNEL_FIELDS if key in channel},
+                                    'fetched_at': client.channel_fetched_at.get(channel_name, now)}
+                     for channel_name, channel in client.channel_cache.items()},
+    }
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    filename = os.path.join(CACHE_DIR, f'{client.team_id}.json')
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+
+async def prime_user_cache(client):
+    """Fills the user cache with every member of the workspace using paginated users.list calls.
+
+    Skipped while the users listed by a previous run are still within USER_CACHE_TTL.
+    """
+    if time.time() - client.users_listed_at <= USER_CACHE_TTL:
+        return
+    users = {}
+    cursor = None
+    try:
+        while True:
+            response = await client.users_list(cursor=cursor, limit=1000)
+            for m in response['members']:
+                users[m['id']] = m.get('real_name') or m.get('profile', {}).get('display_name') or m.get('name')
+            cursor = response.get('response_metadata', {}).get('next_cursor')
+            if not cursor:
+                break
+    except SlackApiError as e:
+        print(f"Error fetching users: {e.response['error']}", file=sys.stderr)
+        return
+    client.user_cache.update(users)
+    client.users_listed_at = time.time()
+    # Stamp the listed users with the listing time; users only known from users.info keep their own stamp
+    for user_id in users:
+        client.user_fetched_at[user_id] = client.users_listed_at
+
+async def get_workspace_info(client):
+    """Fetches the workspace (team) name and ID."""
     try:
-        response = client.team_info()
-        return response['team']['name']
+        response = await client.team_info()
+        return response['team']['name'], response['team']['id']
     except SlackApiError as e:
-        return "default_workspace"
+        return "default_workspace", None
 
-def get_conversation_name(client, conversation):
+async def get_conversation_name(client, conversation):
     """Gets the name of the conversation, handles channels, DMs, and MPIMs."""
     if conversation['is_im']:  # Direct message
         user_id = conversation['user']
-        user_name = get_user_info(client, user_id)
+        user_name = await get_user_info(client, user_id)
         return f"DM with {user_name}"
     elif conversation['is_mpim']:  # Multi-party direct message
         return conversation['name']  # MPIMs have a name
     else:  # Public or private channels
         return conversation['name']
 
-def fetch_conversations(client):
-    """Fetches a list of all public/private channels, DMs (IMs), and multi-party DMs (MPIMs)."""
+async def _paginate_list(client, types, **kwargs):
+    """Fetches every conversation of the given types, following conversations.list pagination cursors."""
     conversations = []
-    try:
-        # Fetch public and private channels
-        response = client.conversations_list(types='public_channel,private_channel', limit=1000, exclude_archived=False)
-        conversations.extend(response['channels'])
-
-        # Fetch DMs (IMs)
-        response = client.conversations_list(types='im', limit=1000)
+    cursor = None
+    while True:
+        response = await client.conversations_list(types=types, limit=1000, cursor=cursor, **kwargs)
         conversations.extend(response['channels'])
+        cursor = response.get('response_metadata', {}).get('next_cursor')
+        if not cursor:
+            return conversations
 
-        # Fetch multi-party DMs (MPIMs)
-        response = client.conversations_list(types='mpim', limit=1000)
-        conversations.extend(response['channels'])
-
-        return conversations
-    except SlackApiError as e:
-        print(f"Error fetching conversations: {e.response['error']}", file=sys.stderr)
-        return []
-
-def fetch_channel_by_id(client, channel_id):
+async def fetch_channel_by_id(client, channel_id):
     """Fetches channel information using the channel ID."""
     try:
-        response = client.conversations_info(channel=channel_id)
+        response = await client.conversations_info(channel=channel_id)
         return response['channel']
     except SlackApiError as e:
         print(f"Error fetching channel info by ID: {e.response['error']}")
         return None
 
-def fetch_channel_by_name(client, channel_name):
+async def fetch_channel_by_name(client, channel_name):
     """Fetches channel information using the channel name."""
-    try:
-        # Fetch public and private channels, MPIMs, and filter by name
-        response = client.conversations_list(types='public_channel,private_channel,mpim', limit=1000)
-        channels = response['channels']
-        for channel in channels:
-            if channel['name'] == channel_name:
-                return channel
+    channel = client.channel_cache.get(channel_name)
+    if channel is None and not client.channels_listed:
+        try:
+            # Fetch public and private channels, MPIMs, and index them by name
+            conversations = await _paginate_list(client, 'public_channel,private_channel,mpim')
+        except SlackApiError as e:
+            print(f"Error fetching channels: {e.response['error']}")
+            return None
+        client.channel_cache = {channel['name']: channel for channel in conversations}
+        client.channel_fetched_at.clear()  # All cached channels are fresh now
+        client.channels_listed = True
+        channel = client.channel_cache.get(channel_name)
+
+    if channel is None:
         print(f"Channel '{channel_name}' not found in conversations_list.")
-        return None
-    except SlackApiError as e:
-        print(f"Error fetching channels: {e.response['error']}")
-        return None
-
-def fetch_channel_messages(client, channel_id, limit=1000):
-    """Fetches the history of messages from a channel and filters out automatic messages."""
+    return channel
+
+async def fetch_channel_messages(client, channel_id, limit=1000):
+    """Fetches the full history of messages from a channel and filters out automatic messages.
+
+    Follows the pagination cursor page by page; the replies of each page's threads are fetched
+    concurrently (into the message cache) while the next page of history is being requested.
+    Returns (messages, complete): messages from oldest to newest, and whether the whole history was fetched.
+    If a page fails, the newer pages fetched before it are still returned with complete set to False.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    user_messages = deque()
+    reply_tasks = []
+    cursor = None
+    complete = True
     try:
-        result = client.conversations_history(channel=channel_id, limit=limit)
-        messages = result['messages']
-
-        # Filter out messages that have a subtype (automatic/system messages)
-        user_messages = [msg for msg in messages if 'subtype' not in msg]
-
-        return user_messages
-    except SlackApiError as e:
-        return []
-
-def fetch_replies(client, channel_id, thread_ts):
+        try:
+            while True:
+                async with semaphore:
+                    result = await client.conversations_history(channel=channel_id, limit=limit, cursor=cursor)
+
+                # Filter out messages that have a subtype (automatic/system messages)
+                page = [msg for msg in result['messages'] if 'subtype' not in msg]
+                # Slack returns newest messages first, so prepending each page keeps the result oldest to newest
+                user_messages.extendleft(page)
+
+                # Start fetching the thread replies of this page without waiting for them
+                thread_list = [msg['thread_ts'] for msg in page if 'thread_ts' in msg]
+                reply_tasks.append(asyncio.ensure_future(asyncio.gather(
+                    *[fetch_replies(client, channel_id, ts, semaphore) for ts in thread_list])))
+
+                cursor = result.get('response_metadata', {}).get('next_cursor')
+                if not cursor:
+                    break
+        except SlackApiError as e:
+            print(f"Error fetching messages: {e.response['error']}", file=sys.stderr)
+            complete = False
+
+        await asyncio.gather(*reply_tasks)
+    finally:
+        # Stop reply fetches that are still running if the history fetch was interrupted
+        for task in reply_tasks:
+            task.cancel()
+        await asyncio.gather(*reply_tasks, return_exceptions=True)
+    return user_messages, complete
+
+async def fetch_replies(client, channel_id, thread_ts, semaphore):
     """Fetches replies for a specific thread in bulk and filters out automatic messages."""
-    if thread_ts in message_cache:
-        return message_cache[thread_ts]
+    if thread_ts in client.message_cache:
+        return client.message_cache[thread_ts]
 
     try:
-        result = client.conversations_replies(channel=channel_id, ts=thread_ts)
+        async with semaphore:
+            result = await client.conversations_replies(channel=channel_id, ts=thread_ts)
         replies = result['messages'][1:]  # Skip the first message (the thread starter)
 
         # Filter out messages that have a subtype (automatic/system messages)
         user_replies = [reply for reply in replies if 'subtype' not in reply]
 
-        message_cache[thread_ts] = user_replies
+        client.message_cache[thread_ts] = user_replies
         return user_replies
     except SlackApiError as e:
         return []
 
-def convert_ts_to_datetime(ts):
-    """Converts Slack's timestamp format into a readable datetime format."""
-    return datetime.fromtimestamp(float(ts), timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
-
-def parse_links(text, output_type='txt'):
-    """Parse Slack's custom link format <http://example.com|example> and handle both <url|text> and <url>."""
+@lru_cache(maxsize=4096)
+def _format_seconds(seconds):
+    t = time.gmtime(seconds)
+    return (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+            f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d} UTC")
 
-    def replace_link(match):
-        url = match.group(1)
-        display_text = match.group(2) if match.group(2) else url  # Use URL if display text is empty
-        if output_type == 'html':
-            return f'<a href="{url}">{display_text}</a>'
+def convert_ts_to_datetime(ts):
+    """Converts Slack's timestamp format into a readable datetime format (cached per second)."""
+    return _format_seconds(int(ts.split('.', 1)[0]))
+
+def _replace_link_txt(match):
+    url = match.group(1)
+    display_text = match.group(2) or url  # Use URL if display text is empty
+    return f'{display_text} ({url})'
+
+def _escape_html(text):
+    """Escapes text for HTML; Slack already encodes &, < and > as entities, so those are decoded first."""
+    if '&' not in text and '<' not in text and '>' not in text:
+        return text
+    return escape(unescape(text), quote=False)
+
+def _replace_link_html(match):
+    url = match.group(1)
+    display_text = match.group(2) or url  # Use URL if display text is empty
+    return f'<a href="{escape(unescape(url))}">{_escape_html(display_text)}</a>'
+
+_link_sub = link_pattern.sub
+
+def parse_links_txt(text):
+    """Parse Slack's custom link format <http://example.com|example> and <http://example.com> into plain text."""
+    if '<http' not in text:  # Most messages have no links, skip the regex for them
+        return text
+    return _link_sub(_replace_link_txt, text)
+
+def parse_links_html(text):
+    """Parse Slack's custom link format <http://example.com|example> and <http://example.com> into HTML anchors.
+
+    The text around the links is HTML-escaped.
+    """
+    if '<http' not in text:  # Most messages have no links, skip the regex for them
+        return _escape_html(text)
+    parts = []
+    position = 0
+    for match in link_pattern.finditer(text):
+        parts.append(_escape_html(text[position:match.start()]))
+        parts.append(_replace_link_html(match))
+        position = match.end()
+    parts.append(_escape_html(text[position:]))
+    return "".join(parts)
+
+async def resolve_users_bulk(client, user_ids):
+    """Fetches the names of the given users concurrently into the user cache."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def resolve(user_id):
+        async with semaphore:
+            await get_user_info(client, user_id)
+
+    await asyncio.gather(*[resolve(user_id) for user_id in user_ids])
+
+async def resolve_user_names(client, messages):
+    """Resolves the user names of all messages and their prefetched replies in one pass.
+
+    Users missing from the user cache are fetched together, then each message gets its name stored as '_user_name'.
+    """
+    all_messages = list(messages)
+    for message in messages:
+        if 'thread_ts' in message:
+            all_messages.extend(client.message_cache.get(message['thread_ts'], []))
+
+    needed = {m.get('user', '') for m in all_messages}
+    await resolve_users_bulk(client, needed - client.user_cache.keys())
+
+    user_cache = client.user_cache
+    for m in all_messages:
+        m['_user_name'] = user_cache.get(m.get('user', ''), "Unknown User")
+
+def iter_flattened(client, messages, parse_links):
+    """Walks the messages and their prefetched thread replies in output order.
+
+    Yields (indent_level, formatted_time, user_name, text) tuples, with indent level 1 for replies and
+    the text rendered by the given link parser. User names must have been resolved by resolve_user_names.
+    """
+    for message in messages:
+        yield 0, convert_ts_to_datetime(message.get('ts', '')), message['_user_name'], parse_links(message.get('text', ''))
+
+        # Replies were prefetched into the message cache together with the channel history
+        if 'thread_ts' in message:
+            for reply in client.message_cache.get(message['thread_ts'], []):
+                yield 1, convert_ts_to_datetime(reply.get('ts', '')), reply['_user_name'], parse_links(reply.get('text', ''))
+
+def write_messages(client, messages, out_path, pbar, parse_links, format_line,
+                   header="", footer="", replies_start="", replies_end=""):
+    """Writes the messages and their replies to out_path in chunks, advancing the progress bar in batches.
+
+    format_line(indent_level, formatted_time, user_name, text) renders each entry; replies_start and
+    replies_end wrap every group of replies, header and footer wrap the whole file.
+    """
+    with open(out_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as file:
+        parts = [header]
+        append = parts.append
+        processed = 0
+        previous_level = 0
+        for level, formatted_time, user_name, text in iter_flattened(client, messages, parse_links):
+            if level != previous_level:
+                append(replies_start if level else replies_end)
+            append(format_line(level, formatted_time, user_name, text))
+            if not level:
+                processed += 1
+                if processed % PBAR_BATCH == 0:
+                    pbar.update(PBAR_BATCH)  # Update progress bar in batches of processed messages
+            previous_level = level
+            if len(parts) >= WRITE_CHUNK_LINES:
+                file.write("".join(parts))
+                parts.clear()
+        if previous_level:
+            append(replies_end)
+        pbar.update(processed % PBAR_BATCH)
+        append(footer)
+        file.write("".join(parts))
+    tqdm.write(f"Messages saved to {out_path}")
+
+def _format_txt_line(level, formatted_time, user_name, text):
+    indent = "    " if level else ""  # Indent replies under the parent message
+    return f"{indent}[{formatted_time}] {user_name}: {text}\n"
+
+def _format_html_line(level, formatted_time, user_name, text):
+    # The text is already escaped by parse_links_html
+    return f"<li><strong>[{formatted_time}] {escape(user_name)}:</strong> {text}</li>\n"
+
+def save_messages_to_txt(client, messages, out_path, pbar):
+    # Add an extra line break after the replies
+    write_messages(client, messages, out_path, pbar, parse_links_txt, _format_txt_line, replies_end="\n")
+
+def save_messages_to_html(client, messages, conversation_name, out_path, pbar):
+    # Indent replies under the parent message, and end the indentation after them
+    write_messages(client, messages, out_path, pbar, parse_links_html, _format_html_line,
+                   header=f"<html><body><h1>Messages from {escape(conversation_name)}</h1><ul>\n",
+                   footer="</ul></body></html>", replies_start="<ul>\n", replies_end="</ul>\n")
+
+async def probe_workspace(workspace, token, session):
+    """Looks for the requested channel in one workspace; returns (client, conversation, workspace_name) or None."""
+    client = SlackExportClient(token=token, session=session)
+    workspace_name, client.team_id = await get_workspace_info(client)
+    if client.team_id:
+        # Reuse the users and channels cached by previous runs, and persist them again on exit
+        load_persistent_cache(client)
+        atexit.register(save_persistent_cache, client)
+    tqdm.write(f"Checking workspace: {workspace_name} ({workspace})")
+
+    # Look for the specified channel name or ID
+    conversation = None
+    if args.channel_name_or_id:
+        if args.channel_name_or_id.startswith('C') or args.channel_name_or_id.startswith('D'):
+            # Try to fetch by ID directly (works for channels and DMs)
+            conversation = await fetch_channel_by_id(client, args.channel_name_or_id)
         else:
-            return f'{display_text} ({url})'
+            # Fetch by name (channels, MPIMs)
+            conversation = await fetch_channel_by_name(client, args.channel_name_or_id)
 
-    return link_pattern.sub(replace_link, text)
-
-def save_messages_to_txt(client, messages, conversation_name, conversation_id, workspace_folder, pbar):
-    sanitized_conversation_name = "".join(
-        [c for c in conversation_name if c.isalnum() or c in (' ', '-', '_')]).rstrip()
-
-    # Ensure the workspace folder exists
-    if not os.path.exists(workspace_folder):
-        os.makedirs(workspace_folder)
+    if not conversation:
+        return None
 
-    filename = os.path.join(workspace_folder, f'{sanitized_conversation_name}.txt')
-    with open(filename, 'w', encoding='utf-8') as file:
-        for message in messages:
-            text = parse_links(message.get('text', ''), 'txt')
-            timestamp = message.get('ts', '')
-            user_id = message.get('user', '')
-            user_name = get_user_info(client, user_id)
-            formatted_time = convert_ts_to_datetime(timestamp)
-
-            # Write the main message
-            file.write(f"[{formatted_time}] {user_name}: {text}\n")
-
-            # Check for replies and fetch them in bulk
-            if 'thread_ts' in message:
-                thread_ts = message['thread_ts']
-                replies = fetch_replies(client, conversation_id, thread_ts)
-                if replies:
-                    for reply in replies:
-                        reply_text = parse_links(reply.get('text', ''), 'txt')
-                        reply_ts = reply.get('ts', '')
-                        reply_user_id = reply.get('user', '')
-                        reply_user_name = get_user_info(client, reply_user_id)
-                        reply_time = convert_ts_to_datetime(reply_ts)
-
-                        # Indent replies under the parent message
-                        file.write(f"    [{reply_time}] {reply_user_name}: {reply_text}\n")
-                    file.write("\n")  # Add an extra line break after the replies
-            pbar.update(1)  # Update progress bar for each processed message
-    tqdm.write(f"Messages saved to {filename}")
-
-def save_messages_to_html(client, messages, conversation_name, conversation_id, workspace_folder, pbar):
-    sanitized_conversation_name = "".join(
-        [c for c in conversation_name if c.isalnum() or c in (' ', '-', '_')]).rstrip()
-
-    # Ensure the workspace folder exists
-    if not os.path.exists(workspace_folder):
-        os.makedirs(workspace_folder)
-
-    filename = os.path.join(workspace_folder, f'{sanitized_conversation_name}.html')
-    with open(filename, 'w', encoding='utf-8') as file:
-        file.write(f"<html><body><h1>Messages from {conversation_name}</h1><ul>\n")
-        for message in messages:
-            text = parse_links(message.get('text', ''), 'html')
-            timestamp = message.get('ts', '')
-            user_id = message.get('user', '')
-            user_name = get_user_info(client, user_id)
-            formatted_time = convert_ts_to_datetime(timestamp)
-
-            # Write the main message
-            file.write(f"<li><strong>[{formatted_time}] {user_name}:</strong> {text}</li>\n")
-
-            # Check for replies and fetch them
-            if 'thread_ts' in message:
-                thread_ts = message['thread_ts']
-                replies = fetch_replies(client, conversation_id, thread_ts)
-                if replies:
-                    file.write(f"<ul>\n")  # Indent replies under the parent message
-                    for reply in replies:
-                        reply_text = parse_links(reply.get('text', ''), 'html')
-                        reply_ts = reply.get('ts', '')
-                        reply_user_id = reply.get('user', '')
-                        reply_user_name = get_user_info(client, reply_user_id)
-                        reply_time = convert_ts_to_datetime(reply_ts)
-                        file.write(f"<li><strong>[{reply_time}] {reply_user_name}:</strong> {reply_text}</li>\n")
-                    file.write("</ul>\n")  # End the indentation for replies
-            pbar.update(1)  # Update progress bar for each processed message
-        file.write("</ul></body></html>")
-    tqdm.write(f"Messages saved to {filename}")
+    # Use the helper function to get the conversation name, handles channels and DMs
+    conversation_name = await get_conversation_name(client, conversation)
+    tqdm.write(f"Found channel '{conversation_name}' in {workspace_name}.")
+    return client, conversation, workspace_name
+
+async def run_export(tokens):
+    # Reuse pooled keep-alive connections to Slack for every API call instead of a new TLS connection per call
+    connector = aiohttp.TCPConnector(limit=HTTP_POOL_SIZE)
+    # slack_sdk ignores the client's timeout when it is given a session, so the timeout is set here
+    timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Try each Slack workspace token concurrently and look for the channel
+        results = await asyncio.gather(*[probe_workspace(workspace, token, session) for workspace, token in tokens.items()])
+        found_channels = [result for result in results if result]
+
+        if not found_channels:
+            print(f"Channel '{args.channel_name_or_id}' not found in any workspaces.")
+            return
+
+        # Download messages for all found channels
+        for client, conversation, workspace_name in found_channels:
+            conversation_id = conversation['id']
+            conversation_name = await get_conversation_name(client, conversation)
+            # Only list the users of workspaces the channel was found in
+            await prime_user_cache(client)
+            messages, complete = await fetch_channel_messages(client, conversation_id)
+            if not complete:
+                tqdm.write(f"Warning: the history of {conversation_name} in {workspace_name} could not be fetched "
+                           f"completely, the export only contains the newest messages.", file=sys.stderr)
+            await resolve_user_names(client, messages)
+
+            # Create a folder for each workspace
+            workspace_folder = Path(workspace_name.replace(' ', '_'))
+            sanitized_conversation_name = unsafe_filename_pattern.sub('', conversation_name).rstrip()
+            out_path = workspace_folder / f'{sanitized_conversation_name}.{args.output_type}'
+
+            # Use a progress bar to indicate how many messages have been processed
+            with tqdm(total=len(messages), desc=f"Processing {conversation_name} from {workspace_name}",
+                      mininterval=0.5, smoothing=0) as pbar:
+                if messages:
+                    os.makedirs(workspace_folder, exist_ok=True)
+                    if args.output_type == 'txt':
+                        save_messages_to_txt(client, messages, out_path, pbar)
+                    elif args.output_type == 'html':
+                        save_messages_to_html(client, messages, conversation_name, out_path, pbar)
+                else:
+                    print(f"No messages found for channel {conversation_name} in {workspace_name}.")
 
 def main():
     tokens = get_slack_tokens()
@@ -243,62 +507,7 @@ def main():
         print("No Slack tokens found in .env file.")
         return
 
-    found_channels = []
-
-    # Try each Slack workspace token and look for the channel
-    for workspace, token in tokens.items():
-        client = WebClient(token=token)
-        workspace_name = get_workspace_name(client)
-        tqdm.write(f"Checking workspace: {workspace_name} ({workspace})")
-
-        # Fetch all conversations in this workspace
-        conversations = fetch_conversations(client)
-
-        # Look for the specified channel name or ID
-        conversation = None
-        if args.channel_name_or_id:
-            if args.channel_name_or_id.startswith('C') or args.channel_name_or_id.startswith('D'):
-                # Try to fetch by ID directly (works for channels and DMs)
-                conversation = fetch_channel_by_id(client, args.channel_name_or_id)
-            else:
-                # Fetch by name (channels, MPIMs)
-                conversation = fetch_channel_by_name(client, args.channel_name_or_id)
-
-        if conversation:
-            conversation_id = conversation['id']
-            # Use the helper function to get the conversation name, handles channels and DMs
-            conversation_name = get_conversation_name(client, conversation)
-
-            # Store the found channel information
-            found_channels.append((client, conversation, workspace_name))
-
-            tqdm.write(f"Found channel '{conversation_name}' in {workspace_name}.")
-
-    if not found_channels:
-        print(f"Channel '{args.channel_name_or_id}' not found in any workspaces.")
-        return
-
-    # Download messages for all found channels
-    for client, conversation, workspace_name in found_channels:
-        conversation_id = conversation['id']
-        conversation_name = get_conversation_name(client, conversation)
-        messages = fetch_channel_messages(client, conversation_id)
-
-        # Reverse the message order to go from oldest to newest
-        messages = list(reversed(messages))
-
-        # Create a folder for each workspace
-        workspace_folder = workspace_name.replace(' ', '_')
-
-        # Use a progress bar to indicate how many messages have been processed
-        with tqdm(total=len(messages), desc=f"Processing {conversation_name} from {workspace_name}") as pbar:
-            if messages:
-                if args.output_type == 'txt':
-                    save_messages_to_txt(client, messages, conversation_name, conversation_id, workspace_folder, pbar)
-                elif args.output_type == 'html':
-                    save_messages_to_html(client, messages, conversation_name, conversation_id, workspace_folder, pbar)
-            else:
-                print(f"No messages found for channel {conversation_name} in {workspace_name}.")
+    asyncio.run(run_export(tokens))
 
 
 if __name__ == "__main__":